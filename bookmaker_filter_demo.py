@@ -10,138 +10,94 @@ Version: 1.0.0
 Last Updated: 2025-01-15
 """
 
-from nba_odds_analyzer import NBAOddsAnalyzer, NBAMarketKeys
+from nba_odds_analyzer import (NBAOddsAnalyzer, NBAMarketKeys, OddsAnalysisError, create_cached_session,
+                               filter_props_by_bookmaker)
 
+DEMO_MARKETS = [NBAMarketKeys.PLAYER_POINTS, NBAMarketKeys.PLAYER_ASSISTS, NBAMarketKeys.PLAYER_REBOUNDS]
 
-def demo_fanduel_only():
+
+def _print_summary(analysis, label, single_bookmaker=False):
+    """Print the prop counts and per-market breakdown shared by every demo."""
+    print(f"\n{label} Props Found: {analysis.total_props}")
+    print(f"Best odds combinations: {analysis.best_odds_count}")
+    
+    # Show market breakdown
+    books_note = f" (should be 1 for {label} only)" if single_bookmaker else ""
+    for market, summary in analysis.market_summary.items():
+        print(f"\n{NBAMarketKeys.get_market_description(market)}:")
+        print(f"  Props: {summary['total_props']}")
+        print(f"  Players: {summary['unique_players']}")
+        print(f"  Bookmakers: {summary['bookmakers']}{books_note}")
+
+
+def demo_fanduel_only(analyzer, game, all_props):
     """Demonstrate FanDuel-only analysis."""
     print("\n" + "="*60)
     print("FANDUEL ONLY ANALYSIS")
     print("="*60)
     
     try:
-        # Initialize analyzer with FanDuel filter
-        analyzer = NBAOddsAnalyzer(bookmaker_filter='fanduel')
-        
-        print(f"Bookmaker filter: {analyzer.bookmaker_filter}")
-        
-        # Get NBA games
-        games = analyzer.get_nba_games()
-        if not games:
-            print("No NBA games found.")
-            return
+        # Filter the all-bookmaker props locally instead of re-fetching the game
+        analysis = analyzer.analyze_props(filter_props_by_bookmaker(all_props, 'fanduel'))
         
-        print(f"\nFound {len(games)} NBA games")
-        
-        # Analyze first game with standard markets
-        game = games[0]
+        print("Bookmaker filter: fanduel")
         print(f"\nAnalyzing: {game.away_team} @ {game.home_team}")
         
-        markets = [NBAMarketKeys.PLAYER_POINTS, NBAMarketKeys.PLAYER_ASSISTS, NBAMarketKeys.PLAYER_REBOUNDS]
-        analysis = analyzer.analyze_game_props(game.game_id, markets)
+        _print_summary(analysis, 'FanDuel', single_bookmaker=True)
         
-        if 'error' not in analysis:
-            print(f"\nFanDuel Props Found: {analysis['total_props']}")
-            print(f"Best odds combinations: {analysis['best_odds_count']}")
-            
-            # Show market breakdown
-            for market, summary in analysis['market_summary'].items():
-                market_name = NBAMarketKeys.get_market_description(market)
-                print(f"\n{market_name}:")
-                print(f"  Props: {summary['total_props']}")
-                print(f"  Players: {summary['unique_players']}")
-                print(f"  Bookmakers: {summary['bookmakers']} (should be 1 for FanDuel only)")
+        analyzer.print_usage_stats()
         
+    except OddsAnalysisError:
+        print("No FanDuel props in this game's odds.")
         analyzer.print_usage_stats()
         
     except Exception as e:
         print(f"Error in FanDuel analysis: {e}")
 
 
-def demo_all_bookmakers():
+def demo_all_bookmakers(analyzer, game, all_props):
     """Demonstrate analysis with all bookmakers."""
     print("\n" + "="*60)
     print("ALL BOOKMAKERS ANALYSIS")
     print("="*60)
     
     try:
-        # Initialize analyzer without filter (all bookmakers)
-        analyzer = NBAOddsAnalyzer()
+        analysis = analyzer.analyze_props(all_props)
         
         print(f"Bookmaker filter: {analyzer.bookmaker_filter or 'None (all bookmakers)'}")
-        
-        # Get NBA games
-        games = analyzer.get_nba_games()
-        if not games:
-            print("No NBA games found.")
-            return
-        
-        print(f"\nFound {len(games)} NBA games")
-        
-        # Analyze first game with standard markets
-        game = games[0]
         print(f"\nAnalyzing: {game.away_team} @ {game.home_team}")
         
-        markets = [NBAMarketKeys.PLAYER_POINTS, NBAMarketKeys.PLAYER_ASSISTS, NBAMarketKeys.PLAYER_REBOUNDS]
-        analysis = analyzer.analyze_game_props(game.game_id, markets)
+        _print_summary(analysis, 'Total')
         
-        if 'error' not in analysis:
-            print(f"\nTotal Props Found: {analysis['total_props']}")
-            print(f"Best odds combinations: {analysis['best_odds_count']}")
-            
-            # Show market breakdown
-            for market, summary in analysis['market_summary'].items():
-                market_name = NBAMarketKeys.get_market_description(market)
-                print(f"\n{market_name}:")
-                print(f"  Props: {summary['total_props']}")
-                print(f"  Players: {summary['unique_players']}")
-                print(f"  Bookmakers: {summary['bookmakers']}")
+        analyzer.print_usage_stats()
         
+    except OddsAnalysisError:
+        print("No bookmaker props in this game's odds.")
         analyzer.print_usage_stats()
         
     except Exception as e:
         print(f"Error in all bookmakers analysis: {e}")
 
 
-def demo_draftkings_only():
+def demo_draftkings_only(analyzer, game, all_props):
     """Demonstrate DraftKings-only analysis."""
     print("\n" + "="*60)
     print("DRAFTKINGS ONLY ANALYSIS")
     print("="*60)
     
     try:
-        # Initialize analyzer with DraftKings filter
-        analyzer = NBAOddsAnalyzer(bookmaker_filter='draftkings')
+        # Filter the all-bookmaker props locally instead of re-fetching the game
+        analysis = analyzer.analyze_props(filter_props_by_bookmaker(all_props, 'draftkings'))
         
-        print(f"Bookmaker filter: {analyzer.bookmaker_filter}")
-        
-        # Get NBA games
-        games = analyzer.get_nba_games()
-        if not games:
-            print("No NBA games found.")
-            return
-        
-        print(f"\nFound {len(games)} NBA games")
-        
-        # Analyze first game with standard markets
-        game = games[0]
+        print("Bookmaker filter: draftkings")
         print(f"\nAnalyzing: {game.away_team} @ {game.home_team}")
         
-        markets = [NBAMarketKeys.PLAYER_POINTS, NBAMarketKeys.PLAYER_ASSISTS, NBAMarketKeys.PLAYER_REBOUNDS]
-        analysis = analyzer.analyze_game_props(game.game_id, markets)
+        _print_summary(analysis, 'DraftKings', single_bookmaker=True)
         
-        if 'error' not in analysis:
-            print(f"\nDraftKings Props Found: {analysis['total_props']}")
-            print(f"Best odds combinations: {analysis['best_odds_count']}")
-            
-            # Show market breakdown
-            for market, summary in analysis['market_summary'].items():
-                market_name = NBAMarketKeys.get_market_description(market)
-                print(f"\n{market_name}:")
-                print(f"  Props: {summary['total_props']}")
-                print(f"  Players: {summary['unique_players']}")
-                print(f"  Bookmakers: {summary['bookmakers']} (should be 1 for DraftKings only)")
+        analyzer.print_usage_stats()
         
+    except OddsAnalysisError:
+        print("No DraftKings props in this game's odds.")
         analyzer.print_usage_stats()
         
     except Exception as e:
@@ -153,14 +109,37 @@ def main():
     print("NBA Odds Analyzer - Bookmaker Filter Demonstration")
     print("=" * 60)
     
+    try:
+        # A single unfiltered analyzer; per-bookmaker views are derived from its props.
+        # Repeated demo runs are served from a local cache (props and slates change slowly)
+        analyzer = NBAOddsAnalyzer(session=create_cached_session(expire_after=300))
+        games = analyzer.get_nba_games()
+    except Exception as e:
+        print(f"Error fetching NBA games: {e}")
+        return
+    
+    if not games:
+        print("No NBA games found.")
+        return
+    
+    print(f"\nFound {len(games)} NBA games")
+    
+    # Fetch the game's odds once for all bookmakers; each demo filters them locally
+    game = games[0]
+    try:
+        all_props = analyzer.get_player_props(game.game_id, DEMO_MARKETS)
+    except Exception as e:
+        print(f"Error fetching player props: {e}")
+        return
+    
     # Demo FanDuel only (as requested)
-    demo_fanduel_only()
+    demo_fanduel_only(analyzer, game, all_props)
     
     # Demo all bookmakers for comparison
-    demo_all_bookmakers()
+    demo_all_bookmakers(analyzer, game, all_props)
     
     # Demo another specific bookmaker
-    demo_draftkings_only()
+    demo_draftkings_only(analyzer, game, all_props)
     
     print("\n" + "="*60)
     print("DEMONSTRATION COMPLETED")
@@ -169,7 +148,7 @@ def main():
     print("- FanDuel filter shows only FanDuel odds (bookmakers count = 1)")
     print("- All bookmakers shows odds from multiple sportsbooks")
     print("- You can filter for any specific bookmaker (e.g., 'draftkings', 'betmgm', etc.)")
-    print("- Filtering reduces API calls and focuses analysis on preferred sportsbook")
+    print("- Filtering focuses analysis on preferred sportsbook; one all-bookmaker fetch can be filtered locally")
 
 
 if __name__ == "__main__":
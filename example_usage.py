@@ -12,272 +12,251 @@ Last Updated: 2025-01-15
 
 import sys
 import json
+import heapq
+from itertools import islice
 from datetime import datetime
-from nba_odds_analyzer import NBAOddsAnalyzer, NBAMarketKeys
+from nba_odds_analyzer import NBAOddsAnalyzer, NBAMarketKeys, OddsAnalysisError, create_cached_session
 
+# Market key lists built once: tuples for ordered iteration, frozensets for membership tests
+STANDARD_MARKETS = NBAMarketKeys.get_standard_markets()
+STANDARD_MARKETS_SET = frozenset(STANDARD_MARKETS)
+ALL_MARKETS = NBAMarketKeys.get_all_markets()
+ALL_MARKETS_SET = frozenset(ALL_MARKETS)
+ALTERNATE_MARKETS = (
+    NBAMarketKeys.PLAYER_POINTS_ALTERNATE,
+    NBAMarketKeys.PLAYER_REBOUNDS_ALTERNATE,
+    NBAMarketKeys.PLAYER_ASSISTS_ALTERNATE,
+    NBAMarketKeys.PLAYER_BLOCKS_ALTERNATE,
+    NBAMarketKeys.PLAYER_STEALS_ALTERNATE,
+    NBAMarketKeys.PLAYER_TURNOVERS_ALTERNATE,
+    NBAMarketKeys.PLAYER_THREES_ALTERNATE
+)
+# The alternate markets analyzed by example_alternate_markets
+CORE_ALTERNATE_MARKETS = (
+    NBAMarketKeys.PLAYER_POINTS_ALTERNATE,
+    NBAMarketKeys.PLAYER_REBOUNDS_ALTERNATE,
+    NBAMarketKeys.PLAYER_ASSISTS_ALTERNATE,
+    NBAMarketKeys.PLAYER_THREES_ALTERNATE
+)
+CORE_ALTERNATE_MARKETS_SET = frozenset(CORE_ALTERNATE_MARKETS)
+COMBINATION_MARKETS = (
+    NBAMarketKeys.PLAYER_POINTS_ASSISTS_ALTERNATE,
+    NBAMarketKeys.PLAYER_POINTS_REBOUNDS_ALTERNATE,
+    NBAMarketKeys.PLAYER_REBOUNDS_ASSISTS_ALTERNATE,
+    NBAMarketKeys.PLAYER_POINTS_REBOUNDS_ASSISTS_ALTERNATE
+)
+COMBINATION_MARKETS_SET = frozenset(COMBINATION_MARKETS)
 
-def example_basic_analysis():
+
+def _props_for_markets(all_props, markets_set):
+    """Select the props whose market is in markets_set from a batched all-markets fetch."""
+    return [prop for prop in all_props if prop.market_key in markets_set]
+
+
+def _print_market_breakdown(analysis):
+    """Print props, players and bookmakers for each market in an analysis."""
+    for market, summary in analysis.market_summary.items():
+        print(f"  {NBAMarketKeys.get_market_description(market)}:")
+        print(f"    Props: {summary['total_props']}")
+        print(f"    Players: {summary['unique_players']}")
+        print(f"    Bookmakers: {summary['bookmakers']}")
+
+
+def example_basic_analysis(analyzer, game, all_props):
     """Example: Basic analysis using standard markets (FanDuel only)."""
     print("\n" + "="*60)
     print("EXAMPLE 1: Basic Analysis with Standard Markets (FanDuel Only)")
     print("="*60)
     
     try:
-        analyzer = NBAOddsAnalyzer(bookmaker_filter='fanduel')
-        
-        # Get NBA games
-        games = analyzer.get_nba_games()
-        if not games:
-            print("No NBA games available for analysis.")
-            return
-        
         # Use standard markets
-        markets = NBAMarketKeys.get_standard_markets()
+        markets = STANDARD_MARKETS
         print(f"Analyzing markets: {', '.join(markets)}")
         
-        # Analyze first game
-        game = games[0]
         print(f"\nGame: {game.away_team} @ {game.home_team}")
         
-        analysis = analyzer.analyze_game_props(game.game_id, markets)
+        analysis = analyzer.analyze_props(_props_for_markets(all_props, STANDARD_MARKETS_SET))
         
-        if 'error' not in analysis:
-            print(f"Total props found: {analysis['total_props']}")
-            print(f"Best odds combinations: {analysis['best_odds_count']}")
-            
-            # Show market breakdown
-            for market, summary in analysis['market_summary'].items():
-                market_name = NBAMarketKeys.get_market_description(market)
-                print(f"  {market_name}: {summary['total_props']} props, {summary['unique_players']} players")
-            
-            # Save data to CSV
-            print("\nSaving basic analysis data to CSV...")
-            all_props = analysis['all_props']
-            best_odds = analysis['best_odds']
-            
-            props_filename = analyzer.save_props_to_csv(all_props, "basic_analysis_props.csv")
-            best_odds_filename = analyzer.save_best_odds_to_csv(best_odds, "basic_analysis_best_odds.csv")
+        print(f"Total props found: {analysis.total_props}")
+        print(f"Best odds combinations: {analysis.best_odds_count}")
+        
+        # Show market breakdown
+        for market, summary in analysis.market_summary.items():
+            market_name = NBAMarketKeys.get_market_description(market)
+            print(f"  {market_name}: {summary['total_props']} props, {summary['unique_players']} players")
+        
+        # Save data to CSV
+        print("\nSaving basic analysis data to CSV...")
+        all_props = analysis.all_props
+        best_odds = analysis.best_odds
+        
+        props_filename = analyzer.save_props_to_csv(all_props, "basic_analysis_props.csv")
+        best_odds_filename = analyzer.save_best_odds_to_csv(best_odds, "basic_analysis_best_odds.csv")
         
         analyzer.print_usage_stats()
         
+    except OddsAnalysisError:
+        print("No standard market props in this game's odds.")
+        analyzer.print_usage_stats()
+        
     except Exception as e:
         print(f"Error in basic analysis: {e}")
 
 
-def example_alternate_markets():
+def example_alternate_markets(analyzer, game, all_props):
     """Example: Analysis using alternate markets (FanDuel only)."""
     print("\n" + "="*60)
     print("EXAMPLE 2: Analysis with Alternate Markets (FanDuel Only)")
     print("="*60)
     
     try:
-        analyzer = NBAOddsAnalyzer(bookmaker_filter='fanduel')
+        print(f"Analyzing alternate markets: {', '.join(CORE_ALTERNATE_MARKETS)}")
         
-        # Get NBA games
-        games = analyzer.get_nba_games()
-        if not games:
-            print("No NBA games available for analysis.")
-            return
-        
-        # Use alternate markets
-        markets = [
-            NBAMarketKeys.PLAYER_POINTS_ALTERNATE,
-            NBAMarketKeys.PLAYER_REBOUNDS_ALTERNATE,
-            NBAMarketKeys.PLAYER_ASSISTS_ALTERNATE,
-            NBAMarketKeys.PLAYER_THREES_ALTERNATE
-        ]
+        print(f"\nGame: {game.away_team} @ {game.home_team}")
         
-        print(f"Analyzing alternate markets: {', '.join(markets)}")
+        analysis = analyzer.analyze_props(_props_for_markets(all_props, CORE_ALTERNATE_MARKETS_SET))
         
-        # Analyze first game
-        game = games[0]
-        print(f"\nGame: {game.away_team} @ {game.home_team}")
+        print(f"Total alternate props found: {analysis.total_props}")
         
-        analysis = analyzer.analyze_game_props(game.game_id, markets)
+        # Show some sample props
+        if analysis.all_props:
+            print("\nSample Alternate Props:")
+            for prop in analysis.all_props[:10]:  # Show first 10
+                print(f"  {prop.player_name} - {prop.market_name}")
+                print(f"    {prop.outcome} {prop.point}: {prop.price:+d} ({prop.bookmaker})")
         
-        if 'error' not in analysis:
-            print(f"Total alternate props found: {analysis['total_props']}")
-            
-            # Show some sample props
-            if analysis['all_props']:
-                print("\nSample Alternate Props:")
-                for prop in analysis['all_props'][:10]:  # Show first 10
-                    print(f"  {prop.player_name} - {prop.market_name}")
-                    print(f"    {prop.outcome} {prop.point}: {prop.price:+d} ({prop.bookmaker})")
+        analyzer.print_usage_stats()
         
+    except OddsAnalysisError:
+        print("No alternate market props in this game's odds.")
         analyzer.print_usage_stats()
         
     except Exception as e:
         print(f"Error in alternate markets analysis: {e}")
 
 
-def example_combination_props():
+def example_combination_props(analyzer, game, all_props):
     """Example: Analysis using combination prop markets (FanDuel only)."""
     print("\n" + "="*60)
     print("EXAMPLE 3: Analysis with Combination Props (FanDuel Only)")
     print("="*60)
     
     try:
-        analyzer = NBAOddsAnalyzer(bookmaker_filter='fanduel')
-        
-        # Get NBA games
-        games = analyzer.get_nba_games()
-        if not games:
-            print("No NBA games available for analysis.")
-            return
+        print(f"Analyzing combination markets: {', '.join(COMBINATION_MARKETS)}")
         
-        # Use combination markets
-        markets = [
-            NBAMarketKeys.PLAYER_POINTS_ASSISTS_ALTERNATE,
-            NBAMarketKeys.PLAYER_POINTS_REBOUNDS_ALTERNATE,
-            NBAMarketKeys.PLAYER_REBOUNDS_ASSISTS_ALTERNATE,
-            NBAMarketKeys.PLAYER_POINTS_REBOUNDS_ASSISTS_ALTERNATE
-        ]
+        print(f"\nGame: {game.away_team} @ {game.home_team}")
         
-        print(f"Analyzing combination markets: {', '.join(markets)}")
+        analysis = analyzer.analyze_props(_props_for_markets(all_props, COMBINATION_MARKETS_SET))
         
-        # Analyze first game
-        game = games[0]
-        print(f"\nGame: {game.away_team} @ {game.home_team}")
+        print(f"Total combination props found: {analysis.total_props}")
         
-        analysis = analyzer.analyze_game_props(game.game_id, markets)
+        # Show market breakdown
+        _print_market_breakdown(analysis)
         
-        if 'error' not in analysis:
-            print(f"Total combination props found: {analysis['total_props']}")
-            
-            # Show market breakdown
-            for market, summary in analysis['market_summary'].items():
-                market_name = NBAMarketKeys.get_market_description(market)
-                print(f"  {market_name}:")
-                print(f"    Props: {summary['total_props']}")
-                print(f"    Players: {summary['unique_players']}")
-                print(f"    Bookmakers: {summary['bookmakers']}")
+        analyzer.print_usage_stats()
         
+    except OddsAnalysisError:
+        print("No combination market props in this game's odds.")
         analyzer.print_usage_stats()
         
     except Exception as e:
         print(f"Error in combination props analysis: {e}")
 
 
-def example_comprehensive_analysis():
+def example_comprehensive_analysis(analyzer, game, all_props):
     """Example: Comprehensive analysis using all available markets (FanDuel only)."""
     print("\n" + "="*60)
     print("EXAMPLE 4: Comprehensive Analysis (All Markets) (FanDuel Only)")
     print("="*60)
     
     try:
-        analyzer = NBAOddsAnalyzer(bookmaker_filter='fanduel')
-        
-        # Get NBA games
-        games = analyzer.get_nba_games()
-        if not games:
-            print("No NBA games available for analysis.")
-            return
-        
         # Use all available markets
-        markets = NBAMarketKeys.get_all_markets()
+        markets = ALL_MARKETS
         print(f"Analyzing ALL {len(markets)} available markets")
         
-        # Analyze first game
-        game = games[0]
         print(f"\nGame: {game.away_team} @ {game.home_team}")
         
-        analysis = analyzer.analyze_game_props(game.game_id, markets)
+        analysis = analyzer.analyze_props(_props_for_markets(all_props, ALL_MARKETS_SET))
         
-        if 'error' not in analysis:
-            print(f"\nComprehensive Analysis Results:")
-            print(f"Total props found: {analysis['total_props']}")
-            print(f"Best odds combinations: {analysis['best_odds_count']}")
-            
-            print("\nDetailed Market Breakdown:")
-            for market, summary in analysis['market_summary'].items():
-                market_name = NBAMarketKeys.get_market_description(market)
-                print(f"  {market_name}:")
-                print(f"    Props: {summary['total_props']}")
-                print(f"    Players: {summary['unique_players']}")
-                print(f"    Bookmakers: {summary['bookmakers']}")
-            
-            # Find best value props (highest odds)
-            if analysis['all_props']:
-                sorted_props = sorted(analysis['all_props'], key=lambda x: x.price, reverse=True)
-                print("\nTop 5 Highest Odds Props:")
-                for prop in sorted_props[:5]:
-                    print(f"  {prop.player_name} - {prop.market_name}")
-                    print(f"    {prop.outcome} {prop.point}: {prop.price:+d} ({prop.bookmaker})")
-            
-            # Save comprehensive data to CSV
-            print("\nSaving comprehensive analysis data to CSV...")
-            all_props = analysis['all_props']
-            best_odds = analysis['best_odds']
-            
-            props_filename = analyzer.save_props_to_csv(all_props, "comprehensive_analysis_props.csv")
-            best_odds_filename = analyzer.save_best_odds_to_csv(best_odds, "comprehensive_analysis_best_odds.csv")
+        print(f"\nComprehensive Analysis Results:")
+        print(f"Total props found: {analysis.total_props}")
+        print(f"Best odds combinations: {analysis.best_odds_count}")
         
+        print("\nDetailed Market Breakdown:")
+        _print_market_breakdown(analysis)
+        
+        # Find best value props (highest odds)
+        if analysis.all_props:
+            top_props = heapq.nlargest(5, analysis.all_props, key=lambda x: x.price)
+            print("\nTop 5 Highest Odds Props:")
+            for prop in top_props:
+                print(f"  {prop.player_name} - {prop.market_name}")
+                print(f"    {prop.outcome} {prop.point}: {prop.price:+d} ({prop.bookmaker})")
+        
+        # Save comprehensive data to CSV
+        print("\nSaving comprehensive analysis data to CSV...")
+        all_props = analysis.all_props
+        best_odds = analysis.best_odds
+        
+        props_filename = analyzer.save_props_to_csv(all_props, "comprehensive_analysis_props.csv")
+        best_odds_filename = analyzer.save_best_odds_to_csv(best_odds, "comprehensive_analysis_best_odds.csv")
+        
+        analyzer.print_usage_stats()
+        
+    except OddsAnalysisError:
+        print("No player props in this game's odds.")
         analyzer.print_usage_stats()
         
     except Exception as e:
         print(f"Error in comprehensive analysis: {e}")
 
 
-def example_specific_player_focus():
+def example_specific_player_focus(analyzer, game, all_props):
     """Example: Focus on specific players across all markets (FanDuel only)."""
     print("\n" + "="*60)
     print("EXAMPLE 5: Player-Focused Analysis (FanDuel Only)")
     print("="*60)
     
     try:
-        analyzer = NBAOddsAnalyzer(bookmaker_filter='fanduel')
-        
-        # Get NBA games
-        games = analyzer.get_nba_games()
-        if not games:
-            print("No NBA games available for analysis.")
-            return
-        
-        # Use standard markets for player focus
-        markets = NBAMarketKeys.get_standard_markets()
-        
-        # Analyze first game
-        game = games[0]
         print(f"Game: {game.away_team} @ {game.home_team}")
         
-        props = analyzer.get_player_props(game.game_id, markets)
+        # Use standard markets for player focus
+        props = _props_for_markets(all_props, STANDARD_MARKETS_SET)
         
         if props:
-            # Group props by player
+            # Group props by player in one pass
             player_props = {}
             for prop in props:
-                if prop.player_name not in player_props:
-                    player_props[prop.player_name] = []
-                player_props[prop.player_name].append(prop)
+                player_props.setdefault(prop.player_name, []).append(prop)
             
             print(f"\nFound props for {len(player_props)} players")
             
-            # Show detailed breakdown for first few players
-            for i, (player, player_prop_list) in enumerate(list(player_props.items())[:3]):
+            # Show detailed breakdown for first few players, grouping only their props by market
+            for i, (player, player_prop_list) in enumerate(islice(player_props.items(), 3)):
                 print(f"\n{i+1}. {player}:")
                 
-                # Group by market
-                market_groups = {}
+                player_markets = {}
                 for prop in player_prop_list:
-                    if prop.market_key not in market_groups:
-                        market_groups[prop.market_key] = []
-                    market_groups[prop.market_key].append(prop)
+                    player_markets.setdefault(prop.market_key, []).append(prop)
                 
-                for market, market_props in market_groups.items():
+                for market, market_props in player_markets.items():
                     market_name = NBAMarketKeys.get_market_description(market)
                     print(f"   {market_name}:")
                     
-                    # Find best odds for Over/Under
-                    over_props = [p for p in market_props if p.outcome == 'Over']
-                    under_props = [p for p in market_props if p.outcome == 'Under']
+                    # Find best odds for Over/Under in a single pass
+                    best_over = best_under = None
+                    for p in market_props:
+                        if p.outcome == 'Over':
+                            if best_over is None or p.price > best_over.price:
+                                best_over = p
+                        elif p.outcome == 'Under':
+                            if best_under is None or p.price > best_under.price:
+                                best_under = p
                     
-                    if over_props:
-                        best_over = max(over_props, key=lambda x: x.price)
+                    if best_over:
                         print(f"     Best Over {best_over.point}: {best_over.price:+d} ({best_over.bookmaker})")
                     
-                    if under_props:
-                        best_under = max(under_props, key=lambda x: x.price)
+                    if best_under:
                         print(f"     Best Under {best_under.point}: {best_under.price:+d} ({best_under.bookmaker})")
             
             # Save player-focused data to CSV
@@ -304,39 +283,18 @@ def show_available_markets():
     print("AVAILABLE NBA MARKET KEYS")
     print("="*60)
     
-    print("\nStandard Markets:")
-    for market in NBAMarketKeys.get_standard_markets():
-        description = NBAMarketKeys.get_market_description(market)
-        print(f"  {market:<30} - {description}")
-    
-    print("\nAlternate Markets:")
-    alternate_markets = [
-        NBAMarketKeys.PLAYER_POINTS_ALTERNATE,
-        NBAMarketKeys.PLAYER_REBOUNDS_ALTERNATE,
-        NBAMarketKeys.PLAYER_ASSISTS_ALTERNATE,
-        NBAMarketKeys.PLAYER_BLOCKS_ALTERNATE,
-        NBAMarketKeys.PLAYER_STEALS_ALTERNATE,
-        NBAMarketKeys.PLAYER_TURNOVERS_ALTERNATE,
-        NBAMarketKeys.PLAYER_THREES_ALTERNATE
-    ]
-    
-    for market in alternate_markets:
-        description = NBAMarketKeys.get_market_description(market)
-        print(f"  {market:<35} - {description}")
-    
-    print("\nCombination Markets:")
-    combination_markets = [
-        NBAMarketKeys.PLAYER_POINTS_ASSISTS_ALTERNATE,
-        NBAMarketKeys.PLAYER_POINTS_REBOUNDS_ALTERNATE,
-        NBAMarketKeys.PLAYER_REBOUNDS_ASSISTS_ALTERNATE,
-        NBAMarketKeys.PLAYER_POINTS_REBOUNDS_ASSISTS_ALTERNATE
+    # Build each section as one string and print it once instead of line by line
+    sections = [
+        ("Standard Markets", STANDARD_MARKETS, 30),
+        ("Alternate Markets", ALTERNATE_MARKETS, 35),
+        ("Combination Markets", COMBINATION_MARKETS, 40)
     ]
+    for title, markets, width in sections:
+        lines = [f"\n{title}:"]
+        lines.extend(f"  {market:<{width}} - {NBAMarketKeys.get_market_description(market)}" for market in markets)
+        print("\n".join(lines))
     
-    for market in combination_markets:
-        description = NBAMarketKeys.get_market_description(market)
-        print(f"  {market:<40} - {description}")
-    
-    print(f"\nTotal Available Markets: {len(NBAMarketKeys.get_all_markets())}")
+    print(f"\nTotal Available Markets: {len(ALL_MARKETS)}")
 
 
 def main():
@@ -349,11 +307,29 @@ def main():
     
     # Run example scenarios
     try:
-        example_basic_analysis()
-        example_alternate_markets()
-        example_combination_props()
-        example_specific_player_focus()
-        # example_comprehensive_analysis()  # Commented out to save API calls
+        # Serve repeated demo runs from a local cache (props and slates change slowly)
+        session = create_cached_session(expire_after=300)
+        analyzer = NBAOddsAnalyzer(bookmaker_filter='fanduel', session=session)
+        
+        # Fetch the games list once and share it across all examples
+        games = analyzer.get_nba_games()
+        if not games:
+            print("No NBA games available for analysis.")
+            return
+        
+        # Fetch every market for the first game in a single request; each
+        # example then analyzes its own slice of the props locally
+        game = games[0]
+        all_props = analyzer.get_player_props(game.game_id, ALL_MARKETS)
+        if not all_props:
+            print("No props found for this game.")
+            return
+        
+        example_basic_analysis(analyzer, game, all_props)
+        example_alternate_markets(analyzer, game, all_props)
+        example_combination_props(analyzer, game, all_props)
+        example_specific_player_focus(analyzer, game, all_props)
+        example_comprehensive_analysis(analyzer, game, all_props)
         
         print("\n" + "="*60)
         print("All examples completed successfully!")
@@ -12,21 +12,44 @@ Last Updated: 2025-01-15
 
 import os
 import sys
+import csv
 import time
 import json
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import cached_property
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: much faster parsing of large odds payloads
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache  # Optional: on-disk response caching (see create_cached_session)
+except ImportError:
+    requests_cache = None
+
 # Load environment variables
 load_dotenv()
 
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
 
-@dataclass
+
+class OddsAnalysisError(Exception):
+    """Raised when an odds analysis cannot be produced, e.g. no props were found."""
+
+
+@dataclass(slots=True, frozen=True)
 class PlayerProp:
     """Data class for player prop betting information."""
     player_name: str
@@ -39,7 +62,7 @@ class PlayerProp:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GameInfo:
     """Data class for NBA game information."""
     game_id: str
@@ -77,78 +100,269 @@ class NBAMarketKeys:
     PLAYER_REBOUNDS_ASSISTS_ALTERNATE = "player_rebounds_assists_alternate"
     PLAYER_POINTS_REBOUNDS_ASSISTS_ALTERNATE = "player_points_rebounds_assists_alternate"
     
+    # Market lists built once at class creation; returned as immutable tuples
+    _STANDARD_MARKETS = (
+        PLAYER_POINTS,
+        PLAYER_REBOUNDS,
+        PLAYER_ASSISTS,
+        PLAYER_THREES,
+        PLAYER_STEALS,
+        PLAYER_BLOCKS,
+        PLAYER_TURNOVERS
+    )
+    _ALL_MARKETS = _STANDARD_MARKETS + (
+        PLAYER_POINTS_ALTERNATE,
+        PLAYER_REBOUNDS_ALTERNATE,
+        PLAYER_ASSISTS_ALTERNATE,
+        PLAYER_BLOCKS_ALTERNATE,
+        PLAYER_STEALS_ALTERNATE,
+        PLAYER_TURNOVERS_ALTERNATE,
+        PLAYER_THREES_ALTERNATE,
+        PLAYER_POINTS_ASSISTS_ALTERNATE,
+        PLAYER_POINTS_REBOUNDS_ALTERNATE,
+        PLAYER_REBOUNDS_ASSISTS_ALTERNATE,
+        PLAYER_POINTS_REBOUNDS_ASSISTS_ALTERNATE
+    )
+    
     @classmethod
-    def get_all_markets(cls) -> List[str]:
+    def get_all_markets(cls) -> Tuple[str, ...]:
         """Return all available NBA player prop market keys."""
-        return [
-            cls.PLAYER_POINTS,
-            cls.PLAYER_REBOUNDS,
-            cls.PLAYER_ASSISTS,
-            cls.PLAYER_THREES,
-            cls.PLAYER_STEALS,
-            cls.PLAYER_BLOCKS,
-            cls.PLAYER_TURNOVERS,
-            cls.PLAYER_POINTS_ALTERNATE,
-            cls.PLAYER_REBOUNDS_ALTERNATE,
-            cls.PLAYER_ASSISTS_ALTERNATE,
-            cls.PLAYER_BLOCKS_ALTERNATE,
-            cls.PLAYER_STEALS_ALTERNATE,
-            cls.PLAYER_TURNOVERS_ALTERNATE,
-            cls.PLAYER_THREES_ALTERNATE,
-            cls.PLAYER_POINTS_ASSISTS_ALTERNATE,
-            cls.PLAYER_POINTS_REBOUNDS_ALTERNATE,
-            cls.PLAYER_REBOUNDS_ASSISTS_ALTERNATE,
-            cls.PLAYER_POINTS_REBOUNDS_ASSISTS_ALTERNATE
-        ]
+        return cls._ALL_MARKETS
     
     @classmethod
-    def get_standard_markets(cls) -> List[str]:
+    def get_standard_markets(cls) -> Tuple[str, ...]:
         """Return standard (non-alternate) NBA player prop market keys."""
-        return [
-            cls.PLAYER_POINTS,
-            cls.PLAYER_REBOUNDS,
-            cls.PLAYER_ASSISTS,
-            cls.PLAYER_THREES,
-            cls.PLAYER_STEALS,
-            cls.PLAYER_BLOCKS,
-            cls.PLAYER_TURNOVERS
-        ]
+        return cls._STANDARD_MARKETS
     
     @classmethod
     def get_market_description(cls, market_key: str) -> str:
         """Get human-readable description for market key."""
-        descriptions = {
-            cls.PLAYER_POINTS: "Player Points (Over/Under)",
-            cls.PLAYER_REBOUNDS: "Player Rebounds (Over/Under)",
-            cls.PLAYER_ASSISTS: "Player Assists (Over/Under)",
-            cls.PLAYER_THREES: "Player Three-Pointers Made (Over/Under)",
-            cls.PLAYER_STEALS: "Player Steals (Over/Under)",
-            cls.PLAYER_BLOCKS: "Player Blocks (Over/Under)",
-            cls.PLAYER_TURNOVERS: "Player Turnovers (Over/Under)",
-            cls.PLAYER_POINTS_ALTERNATE: "Alternate Points (Over/Under)",
-            cls.PLAYER_REBOUNDS_ALTERNATE: "Alternate Rebounds (Over/Under)",
-            cls.PLAYER_ASSISTS_ALTERNATE: "Alternate Assists (Over/Under)",
-            cls.PLAYER_BLOCKS_ALTERNATE: "Alternate Blocks (Over/Under)",
-            cls.PLAYER_STEALS_ALTERNATE: "Alternate Steals (Over/Under)",
-            cls.PLAYER_TURNOVERS_ALTERNATE: "Alternate Turnovers (Over/Under)",
-            cls.PLAYER_THREES_ALTERNATE: "Alternate Three-Pointers (Over/Under)",
-            cls.PLAYER_POINTS_ASSISTS_ALTERNATE: "Alternate Points + Assists (Over/Under)",
-            cls.PLAYER_POINTS_REBOUNDS_ALTERNATE: "Alternate Points + Rebounds (Over/Under)",
-            cls.PLAYER_REBOUNDS_ASSISTS_ALTERNATE: "Alternate Rebounds + Assists (Over/Under)",
-            cls.PLAYER_POINTS_REBOUNDS_ASSISTS_ALTERNATE: "Alternate Points + Rebounds + Assists (Over/Under)"
+        return _MARKET_DESCRIPTIONS.get(market_key, f"Unknown Market: {market_key}")
+
+
+# Human-readable market descriptions, built once at import
+_MARKET_DESCRIPTIONS = {
+    NBAMarketKeys.PLAYER_POINTS: "Player Points (Over/Under)",
+    NBAMarketKeys.PLAYER_REBOUNDS: "Player Rebounds (Over/Under)",
+    NBAMarketKeys.PLAYER_ASSISTS: "Player Assists (Over/Under)",
+    NBAMarketKeys.PLAYER_THREES: "Player Three-Pointers Made (Over/Under)",
+    NBAMarketKeys.PLAYER_STEALS: "Player Steals (Over/Under)",
+    NBAMarketKeys.PLAYER_BLOCKS: "Player Blocks (Over/Under)",
+    NBAMarketKeys.PLAYER_TURNOVERS: "Player Turnovers (Over/Under)",
+    NBAMarketKeys.PLAYER_POINTS_ALTERNATE: "Alternate Points (Over/Under)",
+    NBAMarketKeys.PLAYER_REBOUNDS_ALTERNATE: "Alternate Rebounds (Over/Under)",
+    NBAMarketKeys.PLAYER_ASSISTS_ALTERNATE: "Alternate Assists (Over/Under)",
+    NBAMarketKeys.PLAYER_BLOCKS_ALTERNATE: "Alternate Blocks (Over/Under)",
+    NBAMarketKeys.PLAYER_STEALS_ALTERNATE: "Alternate Steals (Over/Under)",
+    NBAMarketKeys.PLAYER_TURNOVERS_ALTERNATE: "Alternate Turnovers (Over/Under)",
+    NBAMarketKeys.PLAYER_THREES_ALTERNATE: "Alternate Three-Pointers (Over/Under)",
+    NBAMarketKeys.PLAYER_POINTS_ASSISTS_ALTERNATE: "Alternate Points + Assists (Over/Under)",
+    NBAMarketKeys.PLAYER_POINTS_REBOUNDS_ALTERNATE: "Alternate Points + Rebounds (Over/Under)",
+    NBAMarketKeys.PLAYER_REBOUNDS_ASSISTS_ALTERNATE: "Alternate Rebounds + Assists (Over/Under)",
+    NBAMarketKeys.PLAYER_POINTS_REBOUNDS_ASSISTS_ALTERNATE: "Alternate Points + Rebounds + Assists (Over/Under)"
+}
+
+
+# PlayerProp field names in declaration order, and a fast getter returning them as a tuple
+PROP_COLUMNS = [field.name for field in fields(PlayerProp)]
+_prop_row = attrgetter(*PROP_COLUMNS)
+
+
+def _csv_point(point: Optional[float]) -> Optional[float]:
+    """Return a prop line as a float so whole lines are written as 25.0, like the saved CSVs."""
+    return None if point is None else float(point)
+
+
+def best_odds_by_outcome(props: List[PlayerProp]) -> List[PlayerProp]:
+    """Pick the best-priced prop for each player, market, outcome and line.
+    
+    The best cross-book bet on an outcome is simply the highest price offered
+    for it, so a single pass keeping a running maximum per outcome is enough.
+    
+    Args:
+        props: List of PlayerProp objects, typically from several bookmakers
+        
+    Returns:
+        One PlayerProp per (player, market, outcome, point), in first-seen order
+    """
+    best = {}
+    for prop in props:
+        key = (prop.player_name, prop.market_key, prop.outcome, prop.point)
+        current = best.get(key)
+        # Higher odds (more positive) are better; ties keep the first bookmaker seen
+        if current is None or prop.price > current.price:
+            best[key] = prop
+    return list(best.values())
+
+
+def filter_props_by_bookmaker(props: List[PlayerProp], bookmaker: str) -> List[PlayerProp]:
+    """Keep only the props offered by one bookmaker.
+    
+    Applies the same filter as NBAOddsAnalyzer(bookmaker_filter=...) to props that
+    were already fetched for all bookmakers, so no extra API call is needed.
+    
+    Args:
+        props: List of PlayerProp objects
+        bookmaker: Bookmaker key to keep (e.g., 'fanduel')
+        
+    Returns:
+        List of PlayerProp objects from that bookmaker
+    """
+    return [prop for prop in props if prop.bookmaker == bookmaker]
+
+
+def props_to_dataframe(props: List[PlayerProp]) -> pd.DataFrame:
+    """Convert player props to a pandas DataFrame with one column per PlayerProp field.
+    
+    Intended for large prop sets (e.g. many games from analyze_games_props) and for
+    feeding props into statistical models. For a single game the plain Python
+    helpers such as best_odds_by_outcome are faster than building a DataFrame.
+    
+    Args:
+        props: List of PlayerProp objects
+        
+    Returns:
+        DataFrame with columns PROP_COLUMNS. Prices are int32, points float32, and the
+        low-cardinality market_key, bookmaker and outcome columns are categoricals.
+    """
+    # Building from row tuples plus column names avoids a per-row dict
+    df = pd.DataFrame([_prop_row(prop) for prop in props], columns=PROP_COLUMNS)
+    return df.astype({
+        'price': 'int32',
+        'point': 'float32',
+        'market_key': 'category',
+        'bookmaker': 'category',
+        'outcome': 'category'
+    })
+
+
+def _group_best_odds(props: List[PlayerProp]) -> Dict[str, Dict[str, PlayerProp]]:
+    """Group the best-priced props by player + market + point, keyed by outcome."""
+    best_odds = {}
+    
+    for prop in best_odds_by_outcome(props):
+        key = f"{prop.player_name}_{prop.market_key}_{prop.point}"
+        best_odds.setdefault(key, {})[prop.outcome] = prop
+    
+    return best_odds
+
+
+@dataclass
+class AnalysisResult:
+    """Analysis of a set of player props.
+    
+    Only the props are stored; the best odds and market summary are computed
+    on first access, so callers that just need counts or samples skip that work.
+    """
+    all_props: List[PlayerProp]
+    
+    @property
+    def total_props(self) -> int:
+        return len(self.all_props)
+    
+    @property
+    def best_odds_count(self) -> int:
+        return len(self.best_odds)
+    
+    @cached_property
+    def best_odds(self) -> Dict[str, Dict[str, PlayerProp]]:
+        """Best odds with structure: {player_market_key: {'Over': PlayerProp, 'Under': PlayerProp}}"""
+        return _group_best_odds(self.all_props)
+    
+    @cached_property
+    def market_summary(self) -> Dict[str, Dict[str, int]]:
+        """Prop, unique player and bookmaker counts for each market."""
+        # One dict lookup per prop; each market accumulates [count, players, bookmakers]
+        groups = {}
+        for prop in self.all_props:
+            group = groups.get(prop.market_key)
+            if group is None:
+                group = groups[prop.market_key] = [0, set(), set()]
+            group[0] += 1
+            group[1].add(prop.player_name)
+            group[2].add(prop.bookmaker)
+        
+        # Convert sets to counts for JSON serialization
+        market_summary = {
+            market: {
+                'total_props': count,
+                'unique_players': len(players),
+                'bookmakers': len(bookmakers)
+            }
+            for market, (count, players, bookmakers) in groups.items()
         }
-        return descriptions.get(market_key, f"Unknown Market: {market_key}")
+        
+        return market_summary
+
+
+# Process-wide session shared by analyzers, created on first use
+_shared_session = None
+
+
+def _mount_pooled_adapter(session: requests.Session) -> requests.Session:
+    """Mount a pooled adapter that retries transient failures on the session.
+    
+    The adapter retries timeouts, connection errors and RETRYABLE_STATUS_CODES
+    with jittered exponential backoff, honouring Retry-After on 429s.
+    """
+    retry = Retry(total=3, backoff_factor=0.5, backoff_jitter=0.5,
+                  status_forcelist=RETRYABLE_STATUS_CODES, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _get_shared_session() -> requests.Session:
+    """Return the session shared by all analyzers, creating it on first use.
+    
+    Sharing one session lets every analyzer reuse the same pooled keep-alive
+    connections to the API instead of opening a new TLS connection each time.
+    """
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = _mount_pooled_adapter(requests.Session())
+    return _shared_session
+
+
+def create_cached_session(cache_name: str = 'odds_cache', expire_after: int = 300) -> requests.Session:
+    """Create a session that caches Odds API responses on disk.
+    
+    Pass it to NBAOddsAnalyzer(session=...) so repeated runs skip the network.
+    Only analyzers given this session are cached; other HTTP clients in the
+    process are unaffected. Requires the requests-cache package.
+    
+    Args:
+        cache_name: Path of the SQLite cache file (without extension).
+        expire_after: Seconds before a cached response is fetched again.
+        
+    Returns:
+        A requests_cache.CachedSession with the same retrying adapter as the shared session
+    """
+    if requests_cache is None:
+        raise ImportError("create_cached_session requires requests-cache: pip install requests-cache")
+    
+    session = requests_cache.CachedSession(
+        cache_name,
+        backend='sqlite',
+        expire_after=expire_after,
+        ignored_parameters=['apiKey']  # Keep the API key out of cache keys and the cache file
+    )
+    return _mount_pooled_adapter(session)
 
 
 class NBAOddsAnalyzer:
     """Main class for fetching and analyzing NBA player prop odds."""
     
-    def __init__(self, api_key: Optional[str] = None, bookmaker_filter: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, bookmaker_filter: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         """Initialize the NBA Odds Analyzer.
         
         Args:
             api_key: The Odds API key. If None, will try to load from environment.
             bookmaker_filter: Specific bookmaker to filter for (e.g., 'fanduel'). If None, includes all bookmakers.
+            session: Optional requests.Session to use for API requests. If None, a
+                process-wide session with a pooled, retrying adapter is shared.
         """
         self.api_key = api_key or os.getenv('ODDS_API_KEY')
         if not self.api_key:
@@ -158,7 +372,7 @@ class NBAOddsAnalyzer:
         self.sport_key = "basketball_nba"
         self.regions = "us"  # Focus on US bookmakers for NBA
         self.bookmaker_filter = bookmaker_filter  # Store bookmaker filter
-        self.session = requests.Session()
+        self.session = session or _get_shared_session()
         self.session.headers.update({
             'User-Agent': 'NBA-Odds-Analyzer/1.0.0'
         })
@@ -181,16 +395,20 @@ class NBAOddsAnalyzer:
         params['apiKey'] = self.api_key
         
         try:
+            # Transient failures are retried by the session's adapter (see _get_shared_session)
             response = self.session.get(url, params=params, timeout=30)
             
-            # Update usage tracking from headers
-            if 'x-requests-used' in response.headers:
-                self.requests_used = int(response.headers['x-requests-used'])
-            if 'x-requests-remaining' in response.headers:
-                self.requests_remaining = int(response.headers['x-requests-remaining'])
+            # Update usage tracking from headers; cached responses replay old quota
+            # headers, so only live responses update the counters
+            if not getattr(response, 'from_cache', False):
+                if 'x-requests-used' in response.headers:
+                    self.requests_used = int(response.headers['x-requests-used'])
+                if 'x-requests-remaining' in response.headers:
+                    self.requests_remaining = int(response.headers['x-requests-remaining'])
             
             response.raise_for_status()
-            return response.json()
+            # orjson parses the raw bytes directly, skipping the str decode step
+            return orjson.loads(response.content) if orjson else response.json()
             
         except requests.exceptions.RequestException as e:
             print(f"Error making request to {url}: {e}")
@@ -198,6 +416,9 @@ class NBAOddsAnalyzer:
                 print(f"Response status: {e.response.status_code}")
                 print(f"Response text: {e.response.text}")
             return None
+        except ValueError as e:
+            print(f"Error decoding response from {url}: {e}")
+            return None
     
     def get_nba_games(self) -> List[GameInfo]:
         """Fetch current NBA games with available odds.
@@ -246,11 +467,17 @@ class NBAOddsAnalyzer:
         markets_param = ','.join(markets)
         
         params = {
-            'regions': self.regions,
             'markets': markets_param,
             'oddsFormat': 'american'
         }
         
+        # Let the API apply the bookmaker filter so discarded books are never sent.
+        # The API takes either bookmakers or regions, with bookmakers taking priority.
+        if self.bookmaker_filter:
+            params['bookmakers'] = self.bookmaker_filter
+        else:
+            params['regions'] = self.regions
+        
         data = self._make_request(f"sports/{self.sport_key}/events/{game_id}/odds", params)
         if not data:
             return []
@@ -261,29 +488,41 @@ class NBAOddsAnalyzer:
         for bookmaker in data.get('bookmakers', []):
             bookmaker_key = bookmaker['key']
             
-            # Apply bookmaker filter if specified
-            if self.bookmaker_filter and bookmaker_key != self.bookmaker_filter:
-                continue
-            
             for market in bookmaker.get('markets', []):
                 market_key = market['key']
                 market_name = NBAMarketKeys.get_market_description(market_key)
                 
-                for outcome in market.get('outcomes', []):
-                    prop = PlayerProp(
-                        player_name=outcome.get('description', 'Unknown Player'),
-                        market_key=market_key,
-                        market_name=market_name,
-                        bookmaker=bookmaker_key,
-                        outcome=outcome['name'],  # "Over" or "Under"
-                        price=outcome['price'],
-                        point=outcome.get('point'),
-                        description=outcome.get('description')
-                    )
-                    props.append(prop)
+                # Positional arguments in PlayerProp field order:
+                # player_name, market_key, market_name, bookmaker, outcome ("Over"/"Under"),
+                # price, point, description
+                props.extend(
+                    PlayerProp(outcome.get('description', 'Unknown Player'), market_key, market_name,
+                               bookmaker_key, outcome['name'], outcome['price'],
+                               outcome.get('point'), outcome.get('description'))
+                    for outcome in market.get('outcomes', ())
+                )
         
         return props
     
+    def get_player_props_many(self, game_ids: List[str], markets: List[str] = None,
+                              max_workers: int = 5) -> Dict[str, List[PlayerProp]]:
+        """Get player props for several games concurrently.
+        
+        Each game needs its own event-odds request, so the requests are run on a
+        small thread pool sharing this analyzer's session instead of one after another.
+        
+        Args:
+            game_ids: Game IDs from get_nba_games()
+            markets: List of market keys to fetch
+            max_workers: Maximum number of requests in flight at once
+            
+        Returns:
+            Dictionary mapping each game ID to its list of PlayerProp objects
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda game_id: self.get_player_props(game_id, markets), game_ids)
+            return dict(zip(game_ids, results))
+    
     def find_best_odds(self, props: List[PlayerProp]) -> Dict[str, Dict[str, PlayerProp]]:
         """Find the best odds for each player prop.
         
@@ -293,27 +532,9 @@ class NBAOddsAnalyzer:
         Returns:
             Dictionary with structure: {player_market_key: {'Over': PlayerProp, 'Under': PlayerProp}}
         """
-        best_odds = {}
-        
-        for prop in props:
-            # Create unique key for player + market + point
-            key = f"{prop.player_name}_{prop.market_key}_{prop.point}"
-            
-            if key not in best_odds:
-                best_odds[key] = {}
-            
-            # Track best odds for Over and Under separately
-            if prop.outcome not in best_odds[key]:
-                best_odds[key][prop.outcome] = prop
-            else:
-                # Higher odds (more positive) are better
-                current_best = best_odds[key][prop.outcome]
-                if prop.price > current_best.price:
-                    best_odds[key][prop.outcome] = prop
-        
-        return best_odds
+        return _group_best_odds(props)
     
-    def analyze_game_props(self, game_id: str, markets: List[str] = None) -> Dict[str, Any]:
+    def analyze_game_props(self, game_id: str, markets: List[str] = None) -> AnalysisResult:
         """Comprehensive analysis of player props for a game.
         
         Args:
@@ -321,41 +542,53 @@ class NBAOddsAnalyzer:
             markets: List of market keys to analyze
             
         Returns:
-            Dictionary containing analysis results
+            AnalysisResult for the props
+            
+        Raises:
+            OddsAnalysisError: If no props were found for the game
         """
         props = self.get_player_props(game_id, markets)
         if not props:
-            return {'error': 'No props found for this game'}
-        
-        best_odds = self.find_best_odds(props)
-        
-        # Group by market type
-        market_summary = {}
-        for prop in props:
-            market = prop.market_key
-            if market not in market_summary:
-                market_summary[market] = {
-                    'total_props': 0,
-                    'unique_players': set(),
-                    'bookmakers': set()
-                }
+            raise OddsAnalysisError('No props found for this game')
+        
+        return self.analyze_props(props)
+    
+    def analyze_games_props(self, game_ids: List[str], markets: List[str] = None,
+                            max_workers: int = 5) -> Dict[str, AnalysisResult]:
+        """Analyze player props for several games, fetched concurrently.
+        
+        Args:
+            game_ids: Game IDs from get_nba_games()
+            markets: List of market keys to analyze
+            max_workers: Maximum number of requests in flight at once
             
-            market_summary[market]['total_props'] += 1
-            market_summary[market]['unique_players'].add(prop.player_name)
-            market_summary[market]['bookmakers'].add(prop.bookmaker)
+        Returns:
+            Dictionary mapping each game ID to its analyze_game_props() result.
+            Games with no props are left out.
+        """
+        props_by_game = self.get_player_props_many(game_ids, markets, max_workers)
         
-        # Convert sets to counts for JSON serialization
-        for market in market_summary:
-            market_summary[market]['unique_players'] = len(market_summary[market]['unique_players'])
-            market_summary[market]['bookmakers'] = len(market_summary[market]['bookmakers'])
-        
-        return {
-            'total_props': len(props),
-            'best_odds_count': len(best_odds),
-            'market_summary': market_summary,
-            'best_odds': best_odds,
-            'all_props': props
-        }
+        return {game_id: self.analyze_props(props) for game_id, props in props_by_game.items() if props}
+    
+    def analyze_props(self, props: List[PlayerProp]) -> AnalysisResult:
+        """Analyze player props that have already been fetched.
+        
+        Lets callers fetch many markets in one request and analyze subsets
+        of the result locally without further API calls.
+        
+        Args:
+            props: List of PlayerProp objects
+            
+        Returns:
+            AnalysisResult for the props
+            
+        Raises:
+            OddsAnalysisError: If props is empty
+        """
+        if not props:
+            raise OddsAnalysisError('No props to analyze')
+        
+        return AnalysisResult(props)
     
     def save_props_to_csv(self, props: List[PlayerProp], filename: str = None) -> str:
         """Save player props data to a CSV file.
@@ -376,28 +609,20 @@ class NBAOddsAnalyzer:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"nba_odds_data_{timestamp}.csv"
         
-        # Convert props to DataFrame
-        data = []
-        for prop in props:
-            data.append({
-                'timestamp': datetime.now().isoformat(),
-                'player_name': prop.player_name,
-                'market_key': prop.market_key,
-                'market_name': prop.market_name,
-                'bookmaker': prop.bookmaker,
-                'outcome': prop.outcome,
-                'price': prop.price,
-                'point': prop.point,
-                'description': prop.description
-            })
-        
-        df = pd.DataFrame(data)
-        
-        # Save to CSV
+        # Every row shares one save timestamp
+        saved_at = datetime.now().isoformat()
+        
+        # Save to CSV, streaming rows straight from the dataclass fields
         try:
-            df.to_csv(filename, index=False)
+            with open(filename, 'w', newline='', buffering=1 << 20) as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(['timestamp'] + PROP_COLUMNS)
+                writer.writerows((saved_at, prop.player_name, prop.market_key, prop.market_name,
+                                  prop.bookmaker, prop.outcome, prop.price, _csv_point(prop.point),
+                                  prop.description)
+                                 for prop in props)
             print(f"\nOdds data saved to: {filename}")
-            print(f"Total records saved: {len(data)}")
+            print(f"Total records saved: {len(props)}")
             return filename
         except Exception as e:
             print(f"Error saving to CSV: {e}")
@@ -422,40 +647,23 @@ class NBAOddsAnalyzer:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"nba_best_odds_{timestamp}.csv"
         
-        # Convert best odds to DataFrame
-        data = []
-        for key, odds_dict in best_odds.items():
-            # Parse the key to extract player, market, and point
-            parts = key.rsplit('_', 2)  # Split from right to handle player names with underscores
-            if len(parts) >= 3:
-                player_market = '_'.join(parts[:-2])
-                market_key = parts[-2]
-                point = parts[-1]
-            else:
-                player_market = key
-                market_key = 'unknown'
-                point = 'unknown'
-            
-            for outcome, prop in odds_dict.items():
-                data.append({
-                    'timestamp': datetime.now().isoformat(),
-                    'player_name': prop.player_name,
-                    'market_key': prop.market_key,
-                    'market_name': prop.market_name,
-                    'outcome': prop.outcome,
-                    'best_price': prop.price,
-                    'point': prop.point,
-                    'best_bookmaker': prop.bookmaker,
-                    'description': prop.description
-                })
-        
-        df = pd.DataFrame(data)
-        
-        # Save to CSV
+        saved_at = datetime.now().isoformat()
+        
+        # Save to CSV, one row per best-priced outcome
         try:
-            df.to_csv(filename, index=False)
+            rows = 0
+            with open(filename, 'w', newline='', buffering=1 << 20) as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(['timestamp', 'player_name', 'market_key', 'market_name', 'outcome',
+                                 'best_price', 'point', 'best_bookmaker', 'description'])
+                for odds_dict in best_odds.values():
+                    for prop in odds_dict.values():
+                        writer.writerow((saved_at, prop.player_name, prop.market_key,
+                                         prop.market_name, prop.outcome, prop.price, _csv_point(prop.point),
+                                         prop.bookmaker, prop.description))
+                        rows += 1
             print(f"\nBest odds data saved to: {filename}")
-            print(f"Total records saved: {len(data)}")
+            print(f"Total records saved: {rows}")
             return filename
         except Exception as e:
             print(f"Error saving best odds to CSV: {e}")
@@ -482,10 +690,11 @@ def main():
         print("=" * 40)
         print(f"Using API key: {analyzer.api_key[:8]}...")
         print(f"Target sport: {analyzer.sport_key}")
-        print(f"Regions: {analyzer.regions}")
+        # Props requests send either the bookmaker filter or the regions, never both
         if analyzer.bookmaker_filter:
             print(f"Bookmaker filter: {analyzer.bookmaker_filter}")
         else:
+            print(f"Regions: {analyzer.regions}")
             print("Bookmaker filter: All bookmakers")
         
         # Get available NBA games
@@ -512,17 +721,17 @@ def main():
             markets = NBAMarketKeys.get_standard_markets()
             print(f"Markets to analyze: {', '.join(markets)}")
             
-            analysis = analyzer.analyze_game_props(games[0].game_id, markets)
-            
-            if 'error' in analysis:
-                print(f"Error: {analysis['error']}")
+            try:
+                analysis = analyzer.analyze_game_props(games[0].game_id, markets)
+            except OddsAnalysisError as e:
+                print(f"Error: {e}")
             else:
                 print(f"\nAnalysis Results:")
-                print(f"Total props found: {analysis['total_props']}")
-                print(f"Best odds combinations: {analysis['best_odds_count']}")
+                print(f"Total props found: {analysis.total_props}")
+                print(f"Best odds combinations: {analysis.best_odds_count}")
                 
                 print("\nMarket Summary:")
-                for market, summary in analysis['market_summary'].items():
+                for market, summary in analysis.market_summary.items():
                     market_name = NBAMarketKeys.get_market_description(market)
                     print(f"  {market_name}:")
                     print(f"    Props: {summary['total_props']}")
@@ -531,7 +740,7 @@ def main():
                 
                 # Show sample best odds
                 print("\nSample Best Odds (first 5):")
-                best_odds_items = list(analysis['best_odds'].items())[:5]
+                best_odds_items = list(analysis.best_odds.items())[:5]
                 for key, odds in best_odds_items:
                     print(f"\n{key}:")
                     for outcome, prop in odds.items():
@@ -543,7 +752,7 @@ def main():
                 print("="*50)
                 
                 # Save best odds data
-                best_odds = analysis['best_odds']
+                best_odds = analysis.best_odds
                 best_odds_filename = analyzer.save_best_odds_to_csv(best_odds)
                 
                 print("\nCSV file created successfully!")